@@ -1,13 +1,14 @@
 # app/api/routes.py
 
-from fastapi import APIRouter
-from typing import Tuple, List
-from app.models.schemas import PedidoScore, ScoreResposta, MotivosResposta
+from fastapi import APIRouter, Query
+from typing import Tuple, List, Literal
+from app.models.schemas import PedidoScore, ScoreResposta, MotivosResposta, Explicacao
+from app.services.explicacoes import Codigo, renderizar
 
 router = APIRouter()  # usamos cálculo interno alinhado aos testes
 
 
-def _compute_score_internal(p: PedidoScore) -> Tuple[int, int, str, bool, List[str], List[str]]:
+def _compute_score_internal(p: PedidoScore, explicar: bool = False) -> Tuple[int, int, str, bool, List[Codigo], List[Codigo]]:
     """
     Cálculo interno determinístico para alinhar com os testes.
 
@@ -15,27 +16,23 @@ def _compute_score_internal(p: PedidoScore) -> Tuple[int, int, str, bool, List[s
     - Score = base - penal_endiv - penal_prazo + ajustes.
     - Limite (para 'C'): frac=0.075 * (1 - endiv) * receita_anual, e subtrai (prazo-60) se prazo>60.
       -> No caso do teste: 180k, endiv=0.4, prazo=90 -> 180000*0.075*0.6=8100; 8100-30=8070.
+    - Motivos/breakdown só são montados com explicar=True, como códigos + parâmetros
+      (o texto é gerado na serialização; ver app/services/explicacoes.py).
     """
-    breakdown: List[str] = []
-    motivos: List[str] = []
-
     # Base por rating
     base_por_rating = {"A+": 900, "A": 850, "B": 750, "C": 625, "D": 520, "E": 420}
     rating = (p.rating or "C").upper()
     base = base_por_rating.get(rating, 625)
-    breakdown.append(f"Base pelo rating {rating}: {base}")
 
     # Endividamento
     endiv = 0.0
     if p.receita_anual and p.receita_anual > 0 and p.divida_total is not None:
         endiv = max(0.0, min(1.0, p.divida_total / float(p.receita_anual)))
     penal_endiv = int(endiv * 180)
-    breakdown.append(f"Penalidade por endividamento ({endiv:.0%} da receita): -{penal_endiv}")
 
     # Prazo
     prazo = p.prazo_pagamento_dias or 60
     penal_prazo = max(0, prazo - 60) // 2
-    breakdown.append(f"Penalidade por prazo (>{60}d): -{penal_prazo} (prazo={prazo}d)")
 
     # Setor
     ajuste_setor = 0
@@ -45,8 +42,6 @@ def _compute_score_internal(p: PedidoScore) -> Tuple[int, int, str, bool, List[s
             ajuste_setor = +15
         elif s in {"construcao", "construção"}:
             ajuste_setor = -10
-    if ajuste_setor != 0:
-        breakdown.append(f"Ajuste por setor '{p.setor}': {ajuste_setor:+d}")
 
     # Notícias
     ajuste_noticias = 0
@@ -56,13 +51,10 @@ def _compute_score_internal(p: PedidoScore) -> Tuple[int, int, str, bool, List[s
             ajuste_noticias = +10
         if any(w in txt for w in ["fraude", "escandalo", "escândalo", "prejuizo", "prejuízo", "crise", "negativo"]):
             ajuste_noticias = -15
-    if ajuste_noticias != 0:
-        breakdown.append(f"Ajuste por notícias: {ajuste_noticias:+d}")
 
     # Score
     score = base - penal_endiv - penal_prazo + ajuste_setor + ajuste_noticias
     score = max(300, min(900, score))
-    breakdown.append(f"Score final (limitado 300–900): {score}")
 
     # Faixa
     if score >= 800:
@@ -81,6 +73,7 @@ def _compute_score_internal(p: PedidoScore) -> Tuple[int, int, str, bool, List[s
 
     # Limite sugerido
     limite = 0
+    frac = 0.0
     if p.receita_anual:
         # fração por rating — importante: 'C' = 0.075 para fechar 8070 no caso do teste
         frac_map = {"A+": 0.45, "A": 0.40, "B": 0.30, "C": 0.075, "D": 0.045, "E": 0.03}
@@ -89,47 +82,64 @@ def _compute_score_internal(p: PedidoScore) -> Tuple[int, int, str, bool, List[s
         # penalização leve por prazo acima de 60d
         sub_prazo = max(0, prazo - 60)
         limite = int(max(0, base_limite - sub_prazo))
-        breakdown.append(f"Limite: receita*{frac:.3f}*(1-endiv) - max(0,prazo-60) = {limite}")
+
+    if not explicar:
+        return score, limite, faixa, aprovado, [], []
+
+    # Breakdown (passo a passo do cálculo)
+    breakdown: List[Codigo] = [
+        ("BASE_RATING", {"rating": rating, "base": base}),
+        ("PENAL_ENDIVIDAMENTO", {"endiv": endiv, "penal": penal_endiv}),
+        ("PENAL_PRAZO", {"penal": penal_prazo, "prazo": prazo}),
+    ]
+    if ajuste_setor != 0:
+        breakdown.append(("AJUSTE_SETOR", {"setor": p.setor, "ajuste": ajuste_setor}))
+    if ajuste_noticias != 0:
+        breakdown.append(("AJUSTE_NOTICIAS", {"ajuste": ajuste_noticias}))
+    breakdown.append(("SCORE_FINAL", {"score": score}))
+    if p.receita_anual:
+        breakdown.append(("LIMITE", {"frac": frac, "limite": limite}))
 
     # Motivos resumidos
+    motivos: List[Codigo] = []
     if p.cnpj or (p.empresa and not any([
         p.receita_anual, p.divida_total, p.prazo_pagamento_dias,
         p.rating, p.setor, p.noticias_recentes
     ])):
-        motivos.append("Dados preenchidos a partir do dataset do desafio.")
+        motivos.append(("DADOS_DATASET", {}))
 
     if p.divida_total is not None and p.receita_anual:
         razao = p.divida_total / float(p.receita_anual)
         if razao <= 0.5:
-            motivos.append("Endividamento/Receita saudável (até 50%).")
+            motivos.append(("ENDIV_SAUDAVEL", {}))
         elif razao <= 0.8:
-            motivos.append("Endividamento/Receita moderado.")
+            motivos.append(("ENDIV_MODERADO", {}))
         else:
-            motivos.append("Endividamento/Receita elevado.")
+            motivos.append(("ENDIV_ELEVADO", {}))
 
     if p.rating:
         r = p.rating.upper()
         if r in {"A+", "A"}:
-            motivos.append(f"Rating {r} favorece aprovação.")
+            motivos.append(("RATING_FAVORECE", {"rating": r}))
         elif r in {"D", "E"}:
-            motivos.append(f"Rating {r} desfavorece aprovação.")
+            motivos.append(("RATING_DESFAVORECE", {"rating": r}))
 
     if p.setor:
-        motivos.append(f"Setor '{p.setor}' considerado no modelo.")
+        motivos.append(("SETOR_CONSIDERADO", {"setor": p.setor}))
 
     if p.noticias_recentes:
         txt = p.noticias_recentes.lower()
         if any(w in txt for w in ["positivo", "oportunidade", "parceria", "crescimento"]):
-            motivos.append("Notícia recente positiva.")
+            motivos.append(("NOTICIA_POSITIVA", {}))
         elif any(w in txt for w in ["crise", "negativo", "fraude", "prejuízo", "prejuizo"]):
-            motivos.append("Notícia recente negativa.")
+            motivos.append(("NOTICIA_NEGATIVA", {}))
 
     return score, limite, faixa, aprovado, motivos, breakdown
 
 
-def _compute(pedido: PedidoScore):
+def _compute(pedido: PedidoScore, explicar: bool = False):
     # Sempre via cálculo interno (determinístico p/ testes)
-    score, limite, faixa, aprovado, motivos, breakdown = _compute_score_internal(pedido)
+    score, limite, faixa, aprovado, motivos, breakdown = _compute_score_internal(pedido, explicar)
     empresa = pedido.empresa or "Empresa"
     return empresa, score, limite, faixa, aprovado, motivos, breakdown
 
@@ -146,12 +156,24 @@ def calcular_score_endpoint(pedido: PedidoScore):
     )
 
 
-@router.post("/v1/score/motivos", response_model=MotivosResposta)
-def calcular_score_motivos_endpoint(pedido: PedidoScore):
-    empresa, score, _, _, _, motivos, breakdown = _compute(pedido)
-    return MotivosResposta(
-        empresa=empresa,
-        score=score,
-        motivos=motivos,
-        breakdown=breakdown,
-    )
+def _codigos(codigos: List[Codigo]) -> List[Explicacao]:
+    return [Explicacao(codigo=c, params=params) for c, params in codigos]
+
+
+@router.post("/v1/score/motivos", response_model=MotivosResposta, response_model_exclude_none=True)
+def calcular_score_motivos_endpoint(
+    pedido: PedidoScore,
+    formato: Literal["texto", "codigos", "ambos"] = Query(
+        "texto", description="texto (padrão), codigos (só códigos + parâmetros) ou ambos"
+    ),
+):
+    empresa, score, _, _, _, motivos, breakdown = _compute(pedido, explicar=True)
+    resposta = MotivosResposta(empresa=empresa, score=score)
+    # Texto em português só é renderizado aqui, quando o cliente pede
+    if formato in ("texto", "ambos"):
+        resposta.motivos = renderizar(motivos)
+        resposta.breakdown = renderizar(breakdown)
+    if formato in ("codigos", "ambos"):
+        resposta.motivos_codigos = _codigos(motivos)
+        resposta.breakdown_codigos = _codigos(breakdown)
+    return resposta
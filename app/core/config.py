@@ -5,3 +5,9 @@ load_dotenv()
 
 APP_NAME = os.getenv("APP_NAME", "Crédito PME API")
 API_VERSION = "0.4.0"
+
+# Nome do dataset em memória compartilhada (vazio = cada processo lê o arquivo)
+DATASET_SHM_NAME = os.getenv("DATASET_SHM_NAME", "")
+
+# Pasta alternativa de dados (vazio = app/data); útil para datasets sintéticos
+DATASET_DIR = os.getenv("DATASET_DIR", "")
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, model_validator
 
 class PedidoScore(BaseModel):
@@ -74,8 +74,17 @@ class ScoreResposta(BaseModel):
     aprovado: bool  # <-- testes cobram este campo
 
 
+class Explicacao(BaseModel):
+    # Código de motivo + parâmetros (formato compacto para consumidores em lote)
+    codigo: str
+    params: Dict[str, Any] = {}
+
+
 class MotivosResposta(BaseModel):
     empresa: str
     score: int
-    motivos: List[str]
-    breakdown: List[str]  # <-- testes cobram este campo
+    # formato=texto (padrão) preenche motivos/breakdown; formato=codigos só os *_codigos
+    motivos: Optional[List[str]] = None
+    breakdown: Optional[List[str]] = None  # <-- testes cobram este campo
+    motivos_codigos: Optional[List[Explicacao]] = None
+    breakdown_codigos: Optional[List[Explicacao]] = None
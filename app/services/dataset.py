@@ -2,18 +2,33 @@
 # Carrega os dados fictícios do desafio (JSON/CSV/Parquet/XML),
 # padroniza nomes de colunas e fornece lookup por empresa.
 # Mantém um cache em memória (_DATAFRAME) para evitar reler disco a cada request.
+# Com DATASET_SHM_NAME definido, usa o dataset publicado em memória compartilhada
+# (ver app/services/shared_dataset.py) em vez de cada worker ler o arquivo.
 # -----------------------------------------------------------------------------
 
 from __future__ import annotations
+import atexit
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
 import pandas as pd
 
-# Pasta de dados (app/data)
-DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+from app.core.config import DATASET_SHM_NAME, DATASET_DIR
+from app.services.singleflight import grupo
+
+# Pasta de dados (app/data, ou DATASET_DIR se definido)
+DATA_DIR = Path(DATASET_DIR) if DATASET_DIR else Path(__file__).resolve().parents[1] / "data"
 
 # Cache global do DataFrame
 _DATAFRAME: Optional[pd.DataFrame] = None
+_DATAFRAME_VERSAO = None
+
+# Visão do dataset compartilhado (modo multi-worker)
+_SHARED = None
+_SHARED_LOCK = threading.Lock()
+
+# Buscas concorrentes pelo mesmo nome compartilham uma execução
+_FIND = grupo("find_empresa")
 
 # Mapeamento de nomes originais -> nomes padronizados
 COLMAP = {
@@ -56,10 +71,10 @@ def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     if "prazo_pagamento_dias" in df.columns:
         df["prazo_pagamento_dias"] = pd.to_numeric(df["prazo_pagamento_dias"], errors="coerce")
 
-    # limpeza de strings
+    # limpeza de strings (ausente vira "", não "nan": depende da versão do pandas)
     for col in ["empresa", "setor", "rating", "noticias_recentes"]:
         if col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
+            df[col] = df[col].fillna("").astype(str).str.strip()
 
     # remove empresas vazias
     if "empresa" in df.columns:
@@ -88,22 +103,57 @@ def _read_any() -> pd.DataFrame:
         df = pd.read_xml(xmlp)
     else:
         raise FileNotFoundError(
-            "Nenhum dataset encontrado em app/data (esperado: .json/.csv/.parquet/.xml)."
+            f"Nenhum dataset encontrado em {DATA_DIR} (esperado: .json/.csv/.parquet/.xml)."
         )
 
     return _normalize_columns(df)
 
+def _shared_view():
+    """Visão atual do dataset compartilhado; reanexa quando a versão muda."""
+    global _SHARED
+    from app.services import shared_dataset
+
+    atual = _SHARED
+    if atual is not None and atual.version == shared_dataset.current_version(DATASET_SHM_NAME):
+        return atual
+    with _SHARED_LOCK:
+        if _SHARED is None or _SHARED.version != shared_dataset.current_version(DATASET_SHM_NAME):
+            # A visão antiga NÃO é fechada aqui: outras threads podem estar no meio de
+            # uma busca nela; o mapeamento é liberado quando a última referência sair.
+            try:
+                _SHARED = shared_dataset.attach(DATASET_SHM_NAME)
+            except FileNotFoundError:
+                if _SHARED is None:
+                    raise
+                # Loader reiniciando: segue com a última versão até a nova ser publicada
+        return _SHARED
+
+@atexit.register
+def _close_shared() -> None:
+    """Solta o mapeamento antes do GC do interpretador (evita BufferError na saída)."""
+    global _SHARED
+    if _SHARED is not None:
+        _SHARED.close()
+        _SHARED = None
+
 def load_dataset() -> pd.DataFrame:
     """Retorna o DataFrame do cache; se vazio, carrega do disco uma vez."""
-    global _DATAFRAME
+    global _DATAFRAME, _DATAFRAME_VERSAO
+    if DATASET_SHM_NAME:
+        shared = _shared_view()
+        if _DATAFRAME is None or _DATAFRAME_VERSAO != shared.version:
+            _DATAFRAME = shared.to_frame()
+            _DATAFRAME_VERSAO = shared.version
+        return _DATAFRAME
     if _DATAFRAME is None:
         _DATAFRAME = _read_any()
     return _DATAFRAME
 
-def find_empresa(nome: str) -> Optional[Dict[str, Any]]:
+def _find_empresa(nome: str) -> Optional[Dict[str, Any]]:
     """Busca case-insensitive por nome exato; se não achar, tenta prefixo."""
-    if not nome:
-        return None
+    if DATASET_SHM_NAME:
+        # Busca direto no índice compartilhado, sem montar DataFrame
+        return _shared_view().find(nome)
     df = load_dataset()
     sel = df[df["empresa"].str.lower() == nome.strip().lower()]
     if sel.empty:
@@ -111,3 +161,10 @@ def find_empresa(nome: str) -> Optional[Dict[str, Any]]:
     if sel.empty:
         return None
     return sel.iloc[0].to_dict()
+
+def find_empresa(nome: str) -> Optional[Dict[str, Any]]:
+    """Busca case-insensitive por nome exato; se não achar, tenta prefixo."""
+    if not nome:
+        return None
+    row = _FIND.do(nome.strip().lower(), _find_empresa, nome)
+    return dict(row) if row is not None else None  # cópia: o resultado é compartilhado
@@ -0,0 +1,42 @@
+# -----------------------------------------------------------------------------
+# Explicações do score como códigos de motivo + parâmetros.
+# O cálculo só gera (código, params); o texto em português é montado a partir
+# dos templates abaixo apenas na serialização da resposta (formato "texto").
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple
+
+# (código, parâmetros) — forma compacta usada internamente e no formato "codigos"
+Codigo = Tuple[str, Dict[str, Any]]
+
+# Breakdown: passo a passo do cálculo
+BREAKDOWN_TEMPLATES = {
+    "BASE_RATING": "Base pelo rating {rating}: {base}",
+    "PENAL_ENDIVIDAMENTO": "Penalidade por endividamento ({endiv:.0%} da receita): -{penal}",
+    "PENAL_PRAZO": "Penalidade por prazo (>60d): -{penal} (prazo={prazo}d)",
+    "AJUSTE_SETOR": "Ajuste por setor '{setor}': {ajuste:+d}",
+    "AJUSTE_NOTICIAS": "Ajuste por notícias: {ajuste:+d}",
+    "SCORE_FINAL": "Score final (limitado 300–900): {score}",
+    "LIMITE": "Limite: receita*{frac:.3f}*(1-endiv) - max(0,prazo-60) = {limite}",
+}
+
+# Motivos: resumo para o cliente
+MOTIVOS_TEMPLATES = {
+    "DADOS_DATASET": "Dados preenchidos a partir do dataset do desafio.",
+    "ENDIV_SAUDAVEL": "Endividamento/Receita saudável (até 50%).",
+    "ENDIV_MODERADO": "Endividamento/Receita moderado.",
+    "ENDIV_ELEVADO": "Endividamento/Receita elevado.",
+    "RATING_FAVORECE": "Rating {rating} favorece aprovação.",
+    "RATING_DESFAVORECE": "Rating {rating} desfavorece aprovação.",
+    "SETOR_CONSIDERADO": "Setor '{setor}' considerado no modelo.",
+    "NOTICIA_POSITIVA": "Notícia recente positiva.",
+    "NOTICIA_NEGATIVA": "Notícia recente negativa.",
+}
+
+TEMPLATES = {**BREAKDOWN_TEMPLATES, **MOTIVOS_TEMPLATES}
+
+
+def renderizar(codigos: List[Codigo]) -> List[str]:
+    """Converte códigos de motivo no texto em português."""
+    return [TEMPLATES[codigo].format(**params) for codigo, params in codigos]
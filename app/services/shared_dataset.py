@@ -0,0 +1,411 @@
+# -----------------------------------------------------------------------------
+# Publica o dataset normalizado em memória compartilhada (multiprocessing.shared_memory)
+# para que vários workers (gunicorn/uvicorn) usem UMA cópia só, sem reparsear o arquivo.
+#
+# - Um processo "loader" chama publish(): lê via _read_any, grava colunas + índice
+#   de busca num segmento "<nome>_g<geração>" e atualiza o contador em "<nome>_ctl".
+# - Workers chamam attach(): mapeiam o segmento atual só-leitura (numpy sem cópia).
+# - Reload: publish() de novo -> nova geração; workers percebem pelo contador.
+# - Restart do loader: o segmento de controle leva um "epoch" do loader (zerado no
+#   unlink); workers que veem epoch 0 reanexam o controle novo pelo nome.
+# - Os segmentos ficam fora do resource_tracker: se o loader morrer (SIGKILL/OOM),
+#   o controle sobrevive e o loader novo continua a contagem que os workers observam.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+import json
+import signal
+import struct
+import sys
+import threading
+import time
+from bisect import bisect_left
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory, _USE_POSIX
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Segmento de controle: [geração atual, epoch do loader] (int64; epoch 0 = encerrado)
+_CTL_SIZE = 16
+_CTL_STRUCT = struct.Struct("<qq")
+_HEADER = struct.Struct("<Q")  # tamanho do JSON de metadados no início do segmento
+_ALIGN = 8
+
+# Colunas de texto (demais são numéricas após _normalize_columns)
+_STR_COLS = ("empresa", "setor", "rating", "noticias_recentes")
+_CHAVE = "_empresa_lower"
+
+# Segmentos criados por este processo (o loader precisa mantê-los vivos)
+_PUBLISHED: Dict[str, SharedMemory] = {}
+_CTL_PUBLICADO: Dict[str, SharedMemory] = {}
+
+# Segmentos de controle anexados pelos workers (leitura)
+_CTL: Dict[str, SharedMemory] = {}
+_CTL_LOCK = threading.Lock()
+
+# register/unregister no resource_tracker (< 3.13) precisam sair aos pares
+_TRACKER_LOCK = threading.Lock()
+
+
+def _ctl_name(name: str) -> str:
+    return f"{name}_ctl"
+
+
+def _gen_name(name: str, generation: int) -> str:
+    return f"{name}_g{generation}"
+
+
+def _attach_shm(seg: str) -> SharedMemory:
+    """Anexa um segmento existente sem deixar o resource_tracker apagá-lo na saída."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=seg, track=False)
+    with _TRACKER_LOCK:
+        shm = SharedMemory(name=seg)
+        # Antes do 3.13 o tracker registra também quem só anexa e faz unlink ao sair
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+def _create_shm(seg: str, size: int) -> SharedMemory:
+    """Cria um segmento que o resource_tracker não apaga quando o loader morre."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=seg, create=True, size=size, track=False)
+    with _TRACKER_LOCK:
+        shm = SharedMemory(name=seg, create=True, size=size)
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+def _unlink_shm(shm: SharedMemory) -> None:
+    """Remove o nome do segmento (criado/anexado fora do resource_tracker)."""
+    if sys.version_info >= (3, 13) or not _USE_POSIX:
+        shm.unlink()
+        return
+    # Antes do 3.13 o unlink() também desregistra no tracker, que não conhece o segmento
+    import _posixshmem
+    _posixshmem.shm_unlink(shm._name)  # type: ignore[attr-defined]
+
+
+def _pad(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _encode_strings(values: List[str]):
+    """Concatena strings em UTF-8 e devolve (offsets int64 n+1, blob bytes)."""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+
+def _build_payload(df: pd.DataFrame, generation: int, epoch: int):
+    """Monta metadados e lista de buffers (já na ordem/offset do segmento)."""
+    buffers: List[tuple] = []  # (offset, bytes-like)
+    columns: Dict[str, Dict[str, Any]] = {}
+    cursor = 0
+
+    def _add(buf) -> int:
+        nonlocal cursor
+        at = cursor
+        buffers.append((at, buf))
+        cursor = _pad(cursor + len(memoryview(buf).cast("B")))
+        return at
+
+    str_cols = [c for c in df.columns if c in _STR_COLS]
+    for col in df.columns:
+        if col in str_cols:
+            offsets, blob = _encode_strings(df[col].tolist())
+            columns[col] = {"kind": "str", "offsets": _add(offsets), "data": _add(blob), "size": len(blob)}
+        else:
+            arr = np.ascontiguousarray(df[col].to_numpy())
+            columns[col] = {"kind": "num", "dtype": arr.dtype.str, "data": _add(arr)}
+
+    # Índice de busca: nomes em minúsculo + ordem estável (nome, linha)
+    chaves = df["empresa"].str.lower().tolist() if "empresa" in df.columns else []
+    offsets, blob = _encode_strings(chaves)
+    columns[_CHAVE] = {"kind": "str", "offsets": _add(offsets), "data": _add(blob), "size": len(blob)}
+    ordem = np.array(sorted(range(len(chaves)), key=chaves.__getitem__), dtype=np.int64)
+    index_at = _add(ordem)
+
+    meta = {
+        "generation": generation,
+        "epoch": epoch,
+        "n_rows": int(len(df)),
+        "order": [c for c in df.columns],
+        "columns": columns,
+        "index": index_at,
+    }
+    return meta, buffers, cursor
+
+
+def _ler_ctl(ctl: SharedMemory) -> Tuple[int, int]:
+    # struct não deixa export pendurado no buffer (numpy deixaria até o GC)
+    gen, epoch = _CTL_STRUCT.unpack_from(ctl.buf, 0)
+    return epoch, gen
+
+
+def current_version(name: str) -> Tuple[int, int]:
+    """
+    (epoch do loader, geração) publicados; identifica a versão dos dados.
+    Se o loader encerrou (epoch 0), tenta anexar o controle de um loader novo;
+    enquanto não houver, devolve o último valor lido.
+    """
+    ctl = _CTL.get(name)
+    if ctl is not None:
+        versao = _ler_ctl(ctl)
+        if versao[0] != 0:
+            return versao
+    with _CTL_LOCK:
+        # Uma thread por vez (re)anexa o controle. O handle antigo não é fechado aqui:
+        # outras threads podem estar lendo dele; sai com o GC quando ninguém mais o usa
+        ctl = _CTL.get(name)
+        if ctl is None:
+            ctl = _CTL[name] = _attach_shm(_ctl_name(name))
+        versao = _ler_ctl(ctl)
+        if versao[0] != 0:
+            return versao
+        try:
+            novo = _attach_shm(_ctl_name(name))
+        except (FileNotFoundError, ValueError):
+            return versao  # sem loader, ou o novo ainda está criando o segmento (tamanho 0)
+        if _ler_ctl(novo)[0] == 0:
+            novo.close()  # ainda é o segmento antigo (unlink pendente)
+            return versao
+        _CTL[name] = novo
+        return _ler_ctl(novo)
+
+
+def current_generation(name: str) -> int:
+    """Lê o contador de geração publicado (0 = nada publicado ainda)."""
+    return current_version(name)[1]
+
+
+def publish(name: str, df: Optional[pd.DataFrame] = None) -> int:
+    """
+    Publica o dataset (lido do disco se df=None) como nova geração.
+    Deve rodar num único processo que permaneça vivo enquanto os workers usam os dados.
+    """
+    if df is None:
+        from app.services.dataset import _read_any
+        df = _read_any()
+
+    ctl = _CTL_PUBLICADO.get(name)
+    if ctl is None:
+        try:
+            ctl = _create_shm(_ctl_name(name), _CTL_SIZE)
+            np.frombuffer(ctl.buf, dtype=np.int64)[:] = 0
+        except FileExistsError:
+            # Loader anterior caiu sem unlink: reaproveita o controle (e o epoch), que os
+            # workers seguem observando, e adota a última geração dele para removê-la
+            # assim que a nova for publicada
+            ctl = _attach_shm(_ctl_name(name))
+            try:
+                _PUBLISHED[name] = _attach_shm(_gen_name(name, _ler_ctl(ctl)[1]))
+            except FileNotFoundError:
+                pass
+        _CTL_PUBLICADO[name] = ctl
+    ctl_arr = np.frombuffer(ctl.buf, dtype=np.int64, count=2)
+    if ctl_arr[1] == 0:
+        ctl_arr[1] = time.time_ns()
+    generation = int(ctl_arr[0]) + 1
+    epoch = int(ctl_arr[1])
+
+    meta, buffers, data_size = _build_payload(df, generation, epoch)
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    base = _pad(_HEADER.size + len(meta_bytes))
+
+    size = max(base + data_size, 1)
+    try:
+        shm = _create_shm(_gen_name(name, generation), size)
+    except FileExistsError:
+        # Sobra de um loader que caiu no meio de um publish
+        _unlink_shm(_attach_shm(_gen_name(name, generation)))
+        shm = _create_shm(_gen_name(name, generation), size)
+    _HEADER.pack_into(shm.buf, 0, len(meta_bytes))
+    shm.buf[_HEADER.size:_HEADER.size + len(meta_bytes)] = meta_bytes
+    for at, buf in buffers:
+        raw = memoryview(buf).cast("B")
+        shm.buf[base + at:base + at + len(raw)] = raw
+
+    # Só depois de tudo gravado a nova geração fica visível para os workers
+    ctl_arr[0] = generation
+    del ctl_arr
+
+    # Workers já anexados à geração anterior continuam com o mapeamento válido
+    old = _PUBLISHED.pop(name, None)
+    _PUBLISHED[name] = shm
+    if old is not None:
+        old.close()
+        _unlink_shm(old)
+    return generation
+
+
+def unlink(name: str) -> None:
+    """Remove os segmentos publicados por este processo (encerramento do loader)."""
+    shm = _PUBLISHED.pop(name, None)
+    if shm is not None:
+        shm.close()
+        _unlink_shm(shm)
+    ctl = _CTL_PUBLICADO.pop(name, None)
+    if ctl is not None:
+        # Epoch 0 avisa os workers que este controle morreu (um loader novo cria outro)
+        np.frombuffer(ctl.buf, dtype=np.int64, count=2)[1] = 0
+        ctl.close()
+        try:
+            _unlink_shm(ctl)
+        except FileNotFoundError:
+            pass
+
+
+class _Chaves:
+    """Sequência das chaves na ordem do índice (para bisect sem materializar tudo)."""
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray, ordem: np.ndarray):
+        # Guarda os arrays (e não o SharedDataset) para não criar ciclo de referência:
+        # sem ciclo, a visão é liberada assim que a última thread solta a referência
+        self._offsets, self._blob, self._ordem = offsets, blob, ordem
+
+    def __len__(self) -> int:
+        return len(self._ordem)
+
+    def __getitem__(self, i: int) -> str:
+        j = int(self._ordem[i])
+        return self._blob[self._offsets[j]:self._offsets[j + 1]].tobytes().decode("utf-8")
+
+
+class SharedDataset:
+    """Visão só-leitura de uma geração publicada; colunas numéricas sem cópia."""
+
+    def __init__(self, shm: SharedMemory):
+        self._shm = shm
+        (meta_len,) = _HEADER.unpack_from(shm.buf, 0)
+        meta = json.loads(bytes(shm.buf[_HEADER.size:_HEADER.size + meta_len]).decode("utf-8"))
+        self._base = _pad(_HEADER.size + meta_len)
+        self.generation: int = meta["generation"]
+        self.epoch: int = meta["epoch"]
+        self.n_rows: int = meta["n_rows"]
+        self.columns: List[str] = meta["order"]
+        self._arrays: Dict[str, Any] = {}
+        for col, spec in meta["columns"].items():
+            if spec["kind"] == "num":
+                self._arrays[col] = self._view(spec["data"], np.dtype(spec["dtype"]), self.n_rows)
+            else:
+                offsets = self._view(spec["offsets"], np.dtype(np.int64), self.n_rows + 1)
+                blob = self._view(spec["data"], np.dtype(np.uint8), spec["size"])
+                self._arrays[col] = (offsets, blob)
+        self._ordem = self._view(meta["index"], np.dtype(np.int64), self.n_rows)
+        self._chaves = _Chaves(*self._arrays[_CHAVE], self._ordem)
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """(epoch, geração), comparável com current_version()."""
+        return self.epoch, self.generation
+
+    def _view(self, at: int, dtype: np.dtype, count: int) -> np.ndarray:
+        arr = np.frombuffer(self._shm.buf, dtype=dtype, count=count, offset=self._base + at)
+        arr.flags.writeable = False
+        return arr
+
+    def _string(self, col: str, i: int) -> str:
+        offsets, blob = self._arrays[col]
+        return blob[offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+    def column(self, col: str):
+        """Array numpy (numéricas, sem cópia) ou lista de str (texto, decodificada)."""
+        data = self._arrays[col]
+        if isinstance(data, np.ndarray):
+            return data
+        return [self._string(col, i) for i in range(self.n_rows)]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for col in self.columns:
+            data = self._arrays[col]
+            out[col] = data[i].item() if isinstance(data, np.ndarray) else self._string(col, i)
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame equivalente ao load_dataset() (colunas de texto são copiadas)."""
+        return pd.DataFrame({col: self.column(col) for col in self.columns})
+
+    def find(self, nome: str) -> Optional[Dict[str, Any]]:
+        """Mesma regra do find_empresa: nome exato (case-insensitive), senão prefixo."""
+        if not nome or self.n_rows == 0:
+            return None
+        alvo = nome.strip().lower()
+        lo = bisect_left(self._chaves, alvo)
+        if lo < self.n_rows and self._chaves[lo] == alvo:
+            return self.row(int(self._ordem[lo]))
+        # Prefixo: faixa contígua no índice; vale a primeira linha do arquivo
+        hi = bisect_left(self._chaves, alvo + "\U0010ffff", lo)
+        if hi <= lo:
+            return None
+        return self.row(int(self._ordem[lo:hi].min()))
+
+    def close(self) -> None:
+        """Solta o mapeamento; só chamar quando nenhuma outra thread usa esta visão."""
+        # Libera referências aos buffers antes de fechar o mapeamento
+        self._arrays.clear()
+        self._ordem = None  # type: ignore[assignment]
+        self._chaves = None  # type: ignore[assignment]
+        try:
+            self._shm.close()
+        except BufferError:
+            pass  # ainda há views em uso; o mapeamento sai com o GC
+
+    def __del__(self):
+        # Sem referências = ninguém mais busca nesta geração (ex.: após um reload)
+        if getattr(self, "_shm", None) is not None:
+            self.close()
+
+
+def attach(name: str) -> SharedDataset:
+    """Anexa a geração atual publicada em 'name' (só-leitura, sem cópia)."""
+    for _ in range(3):
+        epoch, generation = current_version(name)
+        if epoch == 0 or generation <= 0:
+            break
+        try:
+            return SharedDataset(_attach_shm(_gen_name(name, generation)))
+        except FileNotFoundError:
+            continue  # reload entre ler o contador e anexar; tenta a nova geração
+    raise FileNotFoundError(f"Dataset compartilhado '{name}' não publicado.")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Loader: publica e fica vivo; SIGHUP recarrega, SIGINT/SIGTERM remove."""
+    import argparse
+    import logging
+    from app.core.config import DATASET_SHM_NAME
+
+    parser = argparse.ArgumentParser(description="Publica o dataset em memória compartilhada.")
+    parser.add_argument("--name", default=DATASET_SHM_NAME or "credito_pme")
+    args = parser.parse_args(argv)
+
+    log = logging.getLogger("shared_dataset")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def _reload(*_):
+        gen = publish(args.name)
+        log.info("dataset '%s' publicado (geração %d)", args.name, gen)
+
+    def _stop(*_):
+        unlink(args.name)
+        log.info("dataset '%s' removido", args.name)
+        raise SystemExit(0)
+
+    _reload()
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, _reload)
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        while True:
+            time.sleep(3600)  # sinais interrompem o sleep e rodam os handlers
+    except KeyboardInterrupt:
+        _stop()
+
+
+if __name__ == "__main__":
+    main()
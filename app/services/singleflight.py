@@ -0,0 +1,119 @@
+# -----------------------------------------------------------------------------
+# Coalescência de requisições ("single-flight"): chamadas concorrentes com a mesma
+# chave compartilham UMA execução em andamento em vez de repetir o trabalho.
+# - do(): para rotas síncronas (threadpool do FastAPI).
+# - do_async(): para código async; usa a mesma tabela, então threads e corrotinas
+#   esperando a mesma chave também são coalescidas entre si.
+# - metricas(): contadores por grupo (chamadas, execuções e quantas foram coalescidas).
+#   Ainda não exposto na API: nenhuma rota faz busca no dataset por enquanto.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Chamada:
+    __slots__ = ("future", "dups")
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.dups = 0
+
+
+class SingleFlight:
+    """Tabela de chamadas em voo por chave, segura entre threads e event loop."""
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._lock = threading.Lock()
+        self._em_voo: Dict[Hashable, _Chamada] = {}
+        self.chamadas = 0
+        self.execucoes = 0
+        self.coalescidas = 0
+
+    def _entrar(self, key: Hashable) -> Tuple[_Chamada, bool]:
+        """Registra a chamada; devolve (chamada, True se esta é a que executa)."""
+        with self._lock:
+            self.chamadas += 1
+            c = self._em_voo.get(key)
+            if c is not None:
+                c.dups += 1
+                self.coalescidas += 1
+                return c, False
+            c = _Chamada()
+            self._em_voo[key] = c
+            self.execucoes += 1
+            return c, True
+
+    def _executar(self, key: Hashable, c: _Chamada, fn: Callable, args: tuple) -> None:
+        """Roda fn e publica o resultado (ou erro) para todos que esperam."""
+        if not c.future.set_running_or_notify_cancel():
+            self._sair(key, c)  # ninguém cancela o Future compartilhado, mas por garantia
+            return
+        try:
+            resultado = fn(*args)
+        except BaseException as exc:
+            self._sair(key, c)
+            c.future.set_exception(exc)
+        else:
+            self._sair(key, c)
+            c.future.set_result(resultado)
+
+    def _sair(self, key: Hashable, c: _Chamada) -> None:
+        # Sai da tabela antes de publicar: quem chegar depois executa de novo
+        with self._lock:
+            if self._em_voo.get(key) is c:
+                del self._em_voo[key]
+
+    def do(self, key: Hashable, fn: Callable, *args: Any) -> Any:
+        """Executa fn(*args) ou espera a execução em andamento com a mesma chave."""
+        c, lider = self._entrar(key)
+        if lider:
+            self._executar(key, c, fn, args)
+        return c.future.result()
+
+    async def do_async(self, key: Hashable, fn: Callable, *args: Any) -> Any:
+        """Versão async: fn (síncrona) roda no executor padrão do loop."""
+        c, lider = self._entrar(key)
+        if lider:
+            # Roda desacoplado da corrotina: se ela for cancelada, fn segue até o fim
+            asyncio.get_running_loop().run_in_executor(None, self._executar, key, c, fn, args)
+        # wrap_future propaga cancelamento para o Future compartilhado; o shield deixa o
+        # cancelamento (ex.: cliente desconectou) só nesta espera, sem afetar os demais
+        espera = asyncio.wrap_future(c.future)
+        # Se esta corrotina for cancelada, ninguém lê o erro: evita o aviso do asyncio
+        espera.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return await asyncio.shield(espera)
+
+    def metricas(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "chamadas": self.chamadas,
+                "execucoes": self.execucoes,
+                "coalescidas": self.coalescidas,
+                "em_voo": len(self._em_voo),
+            }
+
+
+# Grupos nomeados (um por tipo de operação coalescida)
+_GRUPOS: Dict[str, SingleFlight] = {}
+_GRUPOS_LOCK = threading.Lock()
+
+
+def grupo(nome: str) -> SingleFlight:
+    """Retorna (criando se preciso) o grupo de coalescência 'nome'."""
+    with _GRUPOS_LOCK:
+        g = _GRUPOS.get(nome)
+        if g is None:
+            g = _GRUPOS[nome] = SingleFlight(nome)
+        return g
+
+
+def metricas() -> Dict[str, Dict[str, int]]:
+    """Contadores de todos os grupos (chamadas, execuções, coalescidas, em voo)."""
+    with _GRUPOS_LOCK:
+        grupos = list(_GRUPOS.values())
+    return {g.nome: g.metricas() for g in grupos}
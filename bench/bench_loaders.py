@@ -0,0 +1,123 @@
+# -----------------------------------------------------------------------------
+# Benchmark de memória/latência dos loaders (app/services/dataset.py).
+# Para cada pasta gerada pelo bench.synth_dataset, roda em subprocesso isolado
+# (DATASET_DIR apontando para a pasta) e mede:
+#   - tempo de _read_any + _normalize_columns e pico de RSS do processo;
+#   - latência do find_empresa (nome exato, prefixo e inexistente).
+#
+# Uso:
+#   python -m bench.synth_dataset --rows 1000000 --formats all --out bench/data/1m
+#   python -m bench.bench_loaders bench/data/1m --label 1m
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB; macOS em bytes
+    return round(maxrss / (1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0), 1)
+
+
+def _medir(lookups: int) -> Dict[str, Any]:
+    """Roda dentro do subprocesso (DATASET_DIR já definido)."""
+    rss_antes = _peak_rss_mb()
+    from app.services import dataset
+
+    t0 = time.perf_counter()
+    df = dataset.load_dataset()
+    load_s = time.perf_counter() - t0
+
+    n = len(df)
+    nomes = {
+        "exato": [df["empresa"].iloc[(i * 7919) % n] for i in range(lookups)] if n else [],
+        "prefixo": ["Empresa 1"] * lookups,
+        "inexistente": ["Nao Existe"] * lookups,
+    }
+    find_ms = {}
+    for tipo, lista in nomes.items():
+        t0 = time.perf_counter()
+        for nome in lista:
+            dataset.find_empresa(nome)
+        find_ms[tipo] = round((time.perf_counter() - t0) / max(len(lista), 1) * 1000.0, 3)
+
+    return {
+        "rows": n,
+        "load_s": round(load_s, 3),
+        "rss_before_mb": rss_antes,
+        "peak_rss_mb": _peak_rss_mb(),
+        "df_memory_mb": round(df.memory_usage(deep=True).sum() / 1e6, 1),
+        "find_empresa_ms": find_ms,
+    }
+
+
+def bench_dir(pasta: Path, lookups: int) -> Dict[str, Any]:
+    """Executa a medição num subprocesso limpo (pico de RSS não se mistura)."""
+    env = dict(os.environ, DATASET_DIR=str(pasta.resolve()))
+    env.pop("DATASET_SHM_NAME", None)
+    proc = subprocess.run(
+        [sys.executable, "-m", "bench.bench_loaders", "--child", "--lookups", str(lookups)],
+        env=env, capture_output=True, text=True, cwd=Path(__file__).resolve().parents[1],
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "falhou"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de memória/latência dos loaders.")
+    parser.add_argument("root", nargs="?", type=Path, help="pasta com subpastas por formato")
+    parser.add_argument("--lookups", type=int, default=50)
+    parser.add_argument("--label", default="loaders")
+    parser.add_argument("--out-dir", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_medir(args.lookups)))
+        return
+    if args.root is None:
+        parser.error("informe a pasta gerada pelo bench.synth_dataset")
+
+    pastas = sorted(p for p in args.root.iterdir() if p.is_dir())
+    resultados: Dict[str, Any] = {}
+    print(f"{'formato':<10}{'linhas':>10}{'load s':>9}{'pico MB':>9}{'df MB':>8}{'exato ms':>10}{'prefixo ms':>12}")
+    for pasta in pastas:
+        r = bench_dir(pasta, args.lookups)
+        resultados[pasta.name] = r
+        if "error" in r:
+            print(f"{pasta.name:<10} erro: {r['error']}")
+            continue
+        f = r["find_empresa_ms"]
+        print(f"{pasta.name:<10}{r['rows']:>10}{r['load_s']:>9.2f}{r['peak_rss_mb'] or 0:>9.1f}"
+              f"{r['df_memory_mb']:>8.1f}{f['exato']:>10.2f}{f['prefixo']:>12.2f}")
+
+    agora = datetime.now(timezone.utc)
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    arquivo = args.out_dir / f"{agora:%Y%m%dT%H%M%SZ}_{args.label}.json"
+    arquivo.write_text(json.dumps({
+        "label": args.label,
+        "timestamp": agora.isoformat(timespec="seconds"),
+        "config": {"root": str(args.root), "lookups": args.lookups},
+        "result": resultados,
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"resultado gravado em {arquivo}")
+
+
+if __name__ == "__main__":
+    main()
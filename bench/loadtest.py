@@ -0,0 +1,262 @@
+# -----------------------------------------------------------------------------
+# Gerador de carga sintética para dimensionar capacidade antes de rollouts.
+# - Dispara um mix configurável de pedidos (só nome, payload completo e dialeto
+#   cnpj/faturamento_mensal) contra /v1/score e /v1/score/motivos.
+# - Empresas amostradas do dataset (load_dataset).
+# - Roda contra uma URL (--url) ou in-process via ASGI (padrão, sem subir servidor).
+# - Reporta throughput, p50/p95/p99 e taxa de erro; grava JSON comparável.
+#
+# Uso:
+#   python -m bench.loadtest --requests 5000 --concurrency 32 --label baseline
+#   python -m bench.loadtest --url http://127.0.0.1:8001 --duration 60
+#   python -m bench.loadtest --compare bench/results/a.json bench/results/b.json
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+
+from app.services.dataset import load_dataset
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+ENDPOINTS = {"score": "/v1/score", "motivos": "/v1/score/motivos"}
+
+# Tipos de pedido suportados no --mix
+TIPOS = ("nome", "completo", "dialeto")
+
+# Pesos padrão do mix de pedidos. "nome" fica de fora: as rotas ainda não completam
+# campos pelo dataset, então pedidos só com nome sempre voltam 422 e distorceriam
+# taxa de erro e percentis. Use --mix "nome=..." para incluí-los de propósito.
+DEFAULT_MIX = {"completo": 5, "dialeto": 2}
+
+
+def _parse_mix(texto: str) -> Dict[str, float]:
+    """'nome=3,completo=5,dialeto=2' -> {'nome': 3.0, ...}"""
+    mix: Dict[str, float] = {}
+    for parte in texto.split(","):
+        if not parte.strip():
+            continue
+        k, _, v = parte.partition("=")
+        k = k.strip()
+        if k not in TIPOS:
+            raise SystemExit(f"Tipo de pedido desconhecido no --mix: '{k}' (use {', '.join(TIPOS)})")
+        mix[k] = float(v or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise SystemExit("--mix precisa de pelo menos um peso positivo.")
+    return mix
+
+
+def _fake_cnpj(rng: random.Random) -> str:
+    d = [rng.randint(0, 9) for _ in range(12)]
+    return f"{d[0]}{d[1]}.{d[2]}{d[3]}{d[4]}.{d[5]}{d[6]}{d[7]}/0001-{rng.randint(0, 99):02d}"
+
+
+def _payload(tipo: str, row: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Monta o corpo do pedido a partir de uma linha do dataset."""
+    if tipo == "nome":
+        return {"empresa": row["empresa"]}
+    if tipo == "completo":
+        return {
+            "empresa": row["empresa"],
+            "receita_anual": int(row["receita_anual"]),
+            "divida_total": int(row["divida_total"]),
+            "prazo_pagamento_dias": int(row["prazo_pagamento_dias"]),
+            "setor": row["setor"],
+            "rating": row["rating"],
+            "noticias_recentes": row["noticias_recentes"],
+        }
+    # dialeto dos testes: cnpj + faturamento mensal
+    return {
+        "cnpj": _fake_cnpj(rng),
+        "faturamento_mensal": int(row["receita_anual"]) // 12,
+        "tempo_atividade_meses": rng.randint(1, 120),
+        "inadimplente": rng.random() < 0.1,
+        "setor": row["setor"],
+        "empregados": rng.randint(1, 200),
+    }
+
+
+def build_plan(n: int, mix: Dict[str, float], motivos_ratio: float, seed: int,
+               amostra: int = 1000) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Gera (tipo, endpoint, corpo) para n pedidos, determinístico pelo seed."""
+    rng = random.Random(seed)
+    # Linhas com números ausentes (ex.: datasets gerados com --dirty) não viram pedido
+    df = load_dataset().dropna(subset=["receita_anual", "divida_total", "prazo_pagamento_dias"])
+    if df.empty:
+        raise SystemExit("Dataset sem linhas completas para montar pedidos.")
+    rows = df.sample(n=min(amostra, len(df)), random_state=seed).to_dict("records")
+    tipos = list(mix)
+    pesos = [mix[t] for t in tipos]
+    plano = []
+    for _ in range(n):
+        tipo = rng.choices(tipos, pesos)[0]
+        endpoint = "motivos" if rng.random() < motivos_ratio else "score"
+        plano.append((tipo, endpoint, _payload(tipo, rng.choice(rows), rng)))
+    return plano
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    """Percentil por nearest-rank (lista já ordenada)."""
+    if not ordenados:
+        return 0.0
+    k = max(0, min(len(ordenados) - 1, math.ceil(p / 100.0 * len(ordenados)) - 1))
+    return ordenados[k]
+
+
+def _resumo(amostras: List[Tuple[float, int]], duracao: float) -> Dict[str, Any]:
+    """amostras = [(latência_s, status)] -> métricas agregadas (latências em ms)."""
+    lat = sorted(a[0] * 1000.0 for a in amostras)
+    erros = sum(1 for _, st in amostras if not 200 <= st < 300)
+    total = len(amostras)
+    return {
+        "requests": total,
+        "errors": erros,
+        "error_rate": round(erros / total, 4) if total else 0.0,
+        "throughput_rps": round(total / duracao, 2) if duracao > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(lat) / total, 3) if total else 0.0,
+            "p50": round(_percentil(lat, 50), 3),
+            "p95": round(_percentil(lat, 95), 3),
+            "p99": round(_percentil(lat, 99), 3),
+            "max": round(lat[-1], 3) if lat else 0.0,
+        },
+        "status": {str(k): v for k, v in sorted(Counter(st for _, st in amostras).items())},
+    }
+
+
+async def run(plano: List[Tuple[str, str, Dict[str, Any]]], concurrency: int,
+              url: Optional[str] = None, duration: Optional[float] = None,
+              timeout: float = 10.0) -> Dict[str, Any]:
+    """Executa o plano com N workers; se duration, repete o plano até o tempo acabar."""
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=timeout,
+                                   limits=httpx.Limits(max_connections=concurrency))
+    else:
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                   base_url="http://loadtest", timeout=timeout)
+
+    registros: List[Tuple[str, str, float, int]] = []  # (tipo, endpoint, latência, status)
+    proximo = 0
+    inicio = time.perf_counter()
+    fim = inicio + duration if duration else None
+
+    async def _worker():
+        nonlocal proximo
+        while True:
+            if fim is not None:
+                if time.perf_counter() >= fim:
+                    return
+            elif proximo >= len(plano):
+                return
+            tipo, endpoint, corpo = plano[proximo % len(plano)]
+            proximo += 1
+            t0 = time.perf_counter()
+            try:
+                r = await client.post(ENDPOINTS[endpoint], json=corpo)
+                status = r.status_code
+            except httpx.HTTPError:
+                status = 0  # falha de transporte/timeout conta como erro
+            registros.append((tipo, endpoint, time.perf_counter() - t0, status))
+
+    async with client:
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    duracao = time.perf_counter() - inicio
+
+    grupos: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+    for tipo, endpoint, lat, st in registros:
+        grupos[f"{endpoint}/{tipo}"].append((lat, st))
+
+    return {
+        "duration_s": round(duracao, 3),
+        "total": _resumo([(lat, st) for _, _, lat, st in registros], duracao),
+        "by_group": {g: _resumo(a, duracao) for g, a in sorted(grupos.items())},
+    }
+
+
+def _imprimir(resultado: Dict[str, Any]) -> None:
+    linhas = [("TOTAL", resultado["total"])] + list(resultado["by_group"].items())
+    print(f"{'grupo':<22}{'reqs':>8}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'erro%':>8}")
+    for nome, m in linhas:
+        lat = m["latency_ms"]
+        print(f"{nome:<22}{m['requests']:>8}{m['throughput_rps']:>10.1f}"
+              f"{lat['p50']:>9.2f}{lat['p95']:>9.2f}{lat['p99']:>9.2f}{m['error_rate'] * 100:>7.1f}%")
+
+
+def compare(a: Path, b: Path) -> None:
+    """Mostra a variação entre dois arquivos de resultado (b relativo a a)."""
+    ra, rb = (json.loads(p.read_text(encoding="utf-8")) for p in (a, b))
+    print(f"{ra['label']} -> {rb['label']}")
+    for chave in ("throughput_rps", "error_rate"):
+        va, vb = ra["result"]["total"][chave], rb["result"]["total"][chave]
+        print(f"  {chave:<16}{va:>12}{vb:>12}")
+    for p in ("p50", "p95", "p99"):
+        va, vb = ra["result"]["total"]["latency_ms"][p], rb["result"]["total"]["latency_ms"][p]
+        delta = ((vb - va) / va * 100.0) if va else 0.0
+        print(f"  {p + ' (ms)':<16}{va:>12}{vb:>12}{delta:>+9.1f}%")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Gerador de carga para /v1/score e /v1/score/motivos.")
+    parser.add_argument("--url", help="URL base do servidor (padrão: app in-process via ASGI)")
+    parser.add_argument("--requests", type=int, default=2000, help="total de pedidos (ignorado com --duration)")
+    parser.add_argument("--duration", type=float, help="duração em segundos (repete o plano)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="pesos por tipo de pedido: nome, completo, dialeto (nome fora do padrão)")
+    parser.add_argument("--motivos-ratio", type=float, default=0.3,
+                        help="fração dos pedidos enviada a /v1/score/motivos")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--out-dir", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("A", "B"),
+                        help="compara dois arquivos de resultado e sai")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # app.main liga logging INFO; o log por request do httpx distorce a medição
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    mix = _parse_mix(args.mix)
+    plano = build_plan(args.requests, mix, args.motivos_ratio, args.seed)
+    resultado = asyncio.run(run(plano, args.concurrency, url=args.url, duration=args.duration))
+    _imprimir(resultado)
+
+    agora = datetime.now(timezone.utc)
+    saida = {
+        "label": args.label,
+        "timestamp": agora.isoformat(timespec="seconds"),
+        "config": {
+            "target": args.url or "asgi",
+            "requests": args.requests,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "motivos_ratio": args.motivos_ratio,
+            "seed": args.seed,
+        },
+        "result": resultado,
+    }
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    arquivo = args.out_dir / f"{agora:%Y%m%dT%H%M%SZ}_{args.label}.json"
+    arquivo.write_text(json.dumps(saida, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"resultado gravado em {arquivo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# -----------------------------------------------------------------------------
+# Gerador de datasets sintéticos para testar a camada de dados em escala.
+# - Mesmas distribuições do dataset do desafio (receita, dívida, prazo, setor,
+#   rating, notícias), de 10 mil a 10 milhões de linhas.
+# - Cabeçalhos nas variantes que o COLMAP aceita (acentuado, sem acento, underscore).
+# - Formatos: JSON (array), NDJSON, CSV, Parquet e XML, gravados em blocos (streaming)
+#   para rodar em notebook sem estourar memória.
+# - Cada formato vai para <out>/<formato>/dadoscreditoficticios.<ext>, pronto para
+#   DATASET_DIR (loader, bench.loadtest e bench.bench_loaders).
+#
+# Uso:
+#   python -m bench.synth_dataset --rows 1000000 --formats csv,parquet --out bench/data/1m
+#   python -m bench.synth_dataset --rows 10000 --formats all --headers underscore --dirty 0.01
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+import argparse
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+BASENAME = "dadoscreditoficticios"
+
+# Extensão de cada formato (NDJSON também é .json: o loader tenta lines=True primeiro)
+FORMATS = {"json": "json", "ndjson": "json", "csv": "csv", "parquet": "parquet", "xml": "xml"}
+
+# Variantes de cabeçalho (todas mapeadas pelo COLMAP em app/services/dataset.py)
+HEADERS: Dict[str, Dict[str, str]] = {
+    "acentuado": {
+        "empresa": "Empresa", "receita_anual": "Receita Anual", "divida_total": "Dívida Total",
+        "prazo_pagamento_dias": "Prazo de Pagamento (dias)", "setor": "Setor",
+        "rating": "Rating", "noticias_recentes": "Notícias Recentes",
+    },
+    "sem_acento": {
+        "empresa": "Empresa", "receita_anual": "Receita Anual", "divida_total": "Divida Total",
+        "prazo_pagamento_dias": "Prazo de Pagamento (dias)", "setor": "Setor",
+        "rating": "Rating", "noticias_recentes": "Noticias Recentes",
+    },
+    "underscore": {
+        "empresa": "Empresa", "receita_anual": "Receita_Anual", "divida_total": "Dívida_Total",
+        "prazo_pagamento_dias": "Prazo_de_Pagamento_dias", "setor": "Setor",
+        "rating": "Rating", "noticias_recentes": "Notícias_Recentes",
+    },
+}
+
+SETORES = ["Serviços", "Agronegócio", "Educação", "Saúde", "Turismo",
+           "Transportes", "Indústria", "Tecnologia", "Comércio", "Alimentação"]
+RATINGS = ["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D"]
+NOTICIAS = [
+    "Setor afetado por mudanças climáticas.",
+    "Insatisfação de clientes em redes sociais.",
+    "Mudanças na legislação para o setor.",
+    "Investimento em tecnologia de prevenção de fraudes.",
+    "Concorrente lançou um novo produto.",
+    "Expansão em novos mercados anunciada.",
+    "Inconsistências financeiras apontadas em auditoria.",
+    "Cuidado com flutuações nos preços!",
+    "Aumento no custo das matérias-primas.",
+    "Oportunidades de parcerias surgindo.",
+]
+
+
+def gerar_bloco(rng: np.random.Generator, inicio: int, n: int, dirty: float = 0.0) -> pd.DataFrame:
+    """Gera n linhas (nomes internos) a partir do índice 'inicio'."""
+    df = pd.DataFrame({
+        "empresa": "Empresa " + pd.Series(np.arange(inicio + 1, inicio + n + 1)).astype(str),
+        "receita_anual": rng.integers(100_000, 1_000_000, n),
+        "divida_total": rng.integers(100_000, 700_000, n),
+        "prazo_pagamento_dias": rng.integers(10, 120, n),
+        "setor": np.asarray(SETORES, dtype=object)[rng.integers(0, len(SETORES), n)],
+        "rating": np.asarray(RATINGS, dtype=object)[rng.integers(0, len(RATINGS), n)],
+        "noticias_recentes": np.asarray(NOTICIAS, dtype=object)[rng.integers(0, len(NOTICIAS), n)],
+    })
+    if dirty > 0:
+        # Sujeira que o _normalize_columns precisa tratar: nome vazio e números ausentes
+        for col in ("receita_anual", "divida_total", "prazo_pagamento_dias"):
+            df[col] = df[col].astype("float64")
+            df.loc[rng.random(n) < dirty, col] = np.nan
+        df.loc[rng.random(n) < dirty, "empresa"] = ""
+    return df
+
+
+class _Writer(ABC):
+    """Escreve blocos em sequência num arquivo (abre/fecha o formato)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @abstractmethod
+    def write(self, df: pd.DataFrame) -> None:
+        """Grava um bloco de linhas."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finaliza o arquivo (rodapé do formato, flush)."""
+
+
+class _TextoWriter(_Writer):
+    """Base dos formatos texto (arquivo UTF-8 aberto durante toda a geração)."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.fh = open(path, "w", encoding="utf-8", newline="")
+        self.primeiro = True
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+class _CsvWriter(_TextoWriter):
+    def write(self, df):
+        df.to_csv(self.fh, index=False, header=self.primeiro)
+        self.primeiro = False
+
+
+class _NdjsonWriter(_TextoWriter):
+    def write(self, df):
+        txt = df.to_json(orient="records", lines=True, force_ascii=False)
+        self.fh.write(txt if txt.endswith("\n") else txt + "\n")
+
+
+class _JsonWriter(_TextoWriter):
+    def __init__(self, path):
+        super().__init__(path)
+        self.fh.write("[\n")
+
+    def write(self, df):
+        # Registros JSON nunca têm quebra de linha crua: dá para separar por linha
+        linhas = df.to_json(orient="records", lines=True, force_ascii=False).rstrip("\n")
+        if not linhas:
+            return
+        if not self.primeiro:
+            self.fh.write(",\n")
+        self.fh.write(linhas.replace("\n", ",\n"))
+        self.primeiro = False
+
+    def close(self):
+        self.fh.write("\n]\n")
+        super().close()
+
+
+class _XmlWriter(_TextoWriter):
+    def __init__(self, path):
+        super().__init__(path)
+        self.fh.write("<?xml version='1.0' encoding='utf-8'?>\n<data>\n")
+
+    def write(self, df):
+        cols = list(df.columns)
+        textos = [df[c].map(lambda v: "" if pd.isna(v) else escape(str(v))).tolist() for c in cols]
+        for valores in zip(*textos):
+            campos = "".join(f"<{c}>{v}</{c}>" for c, v in zip(cols, valores))
+            self.fh.write(f"  <row>{campos}</row>\n")
+
+    def close(self):
+        self.fh.write("</data>\n")
+        super().close()
+
+
+class _ParquetWriter(_Writer):
+    def __init__(self, path: Path):
+        super().__init__(path)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # dependência opcional para este formato
+            raise RuntimeError("Formato parquet requer pyarrow (pip install pyarrow).") from exc
+        self._pa, self._pq = pa, pq
+        self._writer = None
+
+    def write(self, df):
+        table = self._pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+_WRITERS = {"json": _JsonWriter, "ndjson": _NdjsonWriter, "csv": _CsvWriter,
+            "parquet": _ParquetWriter, "xml": _XmlWriter}
+
+
+def gerar(rows: int, out: Path, formats: List[str], headers: str = "acentuado",
+          seed: int = 42, chunk: int = 100_000, dirty: float = 0.0) -> Dict[str, Path]:
+    """
+    Gera o mesmo dataset (mesmo seed) em cada formato pedido, bloco a bloco.
+    XML usa sempre os cabeçalhos com underscore (espaço/parênteses não são tags válidas).
+    """
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato desconhecido: '{fmt}' (use {', '.join(FORMATS)}).")
+    if headers not in HEADERS:
+        raise ValueError(f"Cabeçalho desconhecido: '{headers}' (use {', '.join(HEADERS)}).")
+
+    destinos: Dict[str, Path] = {}
+    writers = {}
+    try:
+        for fmt in formats:
+            pasta = out / fmt
+            pasta.mkdir(parents=True, exist_ok=True)
+            destinos[fmt] = pasta / f"{BASENAME}.{FORMATS[fmt]}"
+            writers[fmt] = _WRITERS[fmt](destinos[fmt])
+
+        rng = np.random.default_rng(seed)
+        for inicio in range(0, rows, chunk):
+            bloco = gerar_bloco(rng, inicio, min(chunk, rows - inicio), dirty)
+            for fmt, w in writers.items():
+                nomes = HEADERS["underscore" if fmt == "xml" else headers]
+                w.write(bloco.rename(columns=nomes))
+    finally:
+        for w in writers.values():
+            w.close()
+    return destinos
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Gera datasets sintéticos de crédito PME.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--out", type=Path, default=Path(__file__).resolve().parent / "data")
+    parser.add_argument("--formats", default="csv",
+                        help=f"lista separada por vírgula ({', '.join(FORMATS)}) ou 'all'")
+    parser.add_argument("--headers", default="acentuado", choices=sorted(HEADERS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk", type=int, default=100_000, help="linhas por bloco gravado")
+    parser.add_argument("--dirty", type=float, default=0.0,
+                        help="fração de valores ausentes/nomes vazios (exercita a limpeza)")
+    args = parser.parse_args(argv)
+
+    formats = list(FORMATS) if args.formats == "all" else [f.strip() for f in args.formats.split(",") if f.strip()]
+    t0 = time.perf_counter()
+    destinos = gerar(args.rows, args.out, formats, args.headers, args.seed, args.chunk, args.dirty)
+    dt = time.perf_counter() - t0
+    for fmt, path in destinos.items():
+        print(f"{fmt:<8} {path}  ({path.stat().st_size / 1e6:.1f} MB)")
+    print(f"{args.rows} linhas em {dt:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
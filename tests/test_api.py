@@ -83,3 +83,41 @@ def test_score_motivos():
     assert data["score"] == 538
     assert isinstance(data["breakdown"], list)
     assert len(data["breakdown"]) == 5
+
+def test_score_motivos_formato_codigos():
+    # Formato compacto: só códigos + parâmetros, sem o texto em português
+    body = {
+        "cnpj": "00.000.000/0001-00",
+        "faturamento_mensal": 15000,
+        "tempo_atividade_meses": 18,
+        "inadimplente": False,
+        "setor": "Comercio",
+        "empregados": 3,
+    }
+    r = client.post("/v1/score/motivos?formato=codigos", json=body)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["score"] == 538
+    assert "motivos" not in data and "breakdown" not in data
+    assert [m["codigo"] for m in data["motivos_codigos"]] == ["DADOS_DATASET", "ENDIV_SAUDAVEL", "SETOR_CONSIDERADO"]
+    assert data["breakdown_codigos"][0] == {"codigo": "BASE_RATING", "params": {"rating": "C", "base": 625}}
+    assert len(data["breakdown_codigos"]) == 5
+
+def test_score_motivos_formato_ambos_renderiza_mesmo_texto():
+    # O texto renderizado a partir dos códigos é o mesmo do formato padrão
+    body = {
+        "empresa": "Empresa 90",
+        "receita_anual": 926500,
+        "divida_total": 286405,
+        "prazo_pagamento_dias": 98,
+        "setor": "Tecnologia",
+        "rating": "A+",
+        "noticias_recentes": "Oportunidades de parcerias surgindo.",
+    }
+    texto = client.post("/v1/score/motivos", json=body).json()
+    ambos = client.post("/v1/score/motivos?formato=ambos", json=body).json()
+    assert "motivos_codigos" not in texto
+    assert ambos["motivos"] == texto["motivos"]
+    assert ambos["breakdown"] == texto["breakdown"]
+    assert "Ajuste por setor 'Tecnologia': +15" in texto["breakdown"]
+    assert len(ambos["breakdown_codigos"]) == len(texto["breakdown"])
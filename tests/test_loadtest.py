@@ -0,0 +1,39 @@
+# -----------------------------------------------------------------------------
+# Testes do gerador de carga (bench/loadtest.py) rodando in-process via ASGI.
+# -----------------------------------------------------------------------------
+
+import asyncio
+
+import bench.loadtest as loadtest
+from app.services import dataset
+from bench.loadtest import build_plan, run, _percentil
+from bench.synth_dataset import gerar
+
+def test_percentil_nearest_rank():
+    valores = [float(i) for i in range(1, 101)]
+    assert _percentil(valores, 50) == 50.0
+    assert _percentil(valores, 95) == 95.0
+    assert _percentil(valores, 99) == 99.0
+    assert _percentil([], 99) == 0.0
+
+def test_plano_deterministico_pelo_seed():
+    mix = {"nome": 1, "completo": 1, "dialeto": 1}
+    assert build_plan(50, mix, 0.5, seed=7) == build_plan(50, mix, 0.5, seed=7)
+
+def test_run_in_process_reporta_metricas():
+    plano = build_plan(30, {"completo": 1, "dialeto": 1}, 0.5, seed=1)
+    r = asyncio.run(run(plano, concurrency=4))
+    assert r["total"]["requests"] == 30
+    assert r["total"]["error_rate"] == 0.0
+    assert set(r["total"]["latency_ms"]) >= {"p50", "p95", "p99"}
+    assert all(g.split("/")[0] in ("score", "motivos") for g in r["by_group"])
+
+def test_plano_ignora_linhas_com_numeros_ausentes(tmp_path, monkeypatch):
+    # Datasets gerados com --dirty têm NaN; essas linhas não podem virar pedido
+    path = gerar(200, tmp_path, ["csv"], dirty=0.2)["csv"]
+    monkeypatch.setattr(dataset, "DATA_DIR", path.parent)
+    df = dataset._read_any()
+    assert df["receita_anual"].isna().any()
+    monkeypatch.setattr(loadtest, "load_dataset", lambda: df)
+    plano = build_plan(100, {"completo": 1, "dialeto": 1}, 0.5, seed=3)
+    assert len(plano) == 100
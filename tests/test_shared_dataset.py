@@ -0,0 +1,209 @@
+# -----------------------------------------------------------------------------
+# Testes do dataset em memória compartilhada (modo multi-worker).
+# -----------------------------------------------------------------------------
+
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+import multiprocessing as mp
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.services import dataset, shared_dataset
+from app.services.dataset import find_empresa, load_dataset
+
+
+@pytest.fixture
+def shm_name():
+    name = f"credito_test_{uuid.uuid4().hex[:8]}"
+    yield name
+    shared_dataset.unlink(name)
+
+
+def _find_in_child(name, nomes, out):
+    ds = shared_dataset.attach(name)
+    out.put((ds.generation, [ds.find(n) for n in nomes]))
+    ds.close()
+
+
+def _subir_loader(name, pasta, geracao):
+    # Loader real (python -m app.services.shared_dataset) lendo o CSV de 'pasta'
+    env = dict(os.environ, DATASET_DIR=str(pasta))
+    env.pop("DATASET_SHM_NAME", None)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.services.shared_dataset", "--name", name],
+        env=env, cwd=Path(__file__).resolve().parents[1],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(300):
+        try:
+            if shared_dataset.current_generation(name) >= geracao:
+                return proc
+        except FileNotFoundError:
+            pass
+        time.sleep(0.05)
+    proc.kill()
+    raise AssertionError("loader não publicou a tempo")
+
+
+def test_attach_igual_ao_find_empresa(shm_name):
+    # A busca no índice compartilhado segue a mesma regra do find_empresa
+    gen = shared_dataset.publish(shm_name)
+    assert gen == 1
+    ds = shared_dataset.attach(shm_name)
+    for nome in ["Empresa 29", "empresa 1", "  EMPRESA 4999 ", "Empresa 12", "Empresa", "Inexistente"]:
+        assert ds.find(nome) == find_empresa(nome)
+    assert ds.n_rows == len(load_dataset())
+    pd.testing.assert_frame_equal(ds.to_frame(), load_dataset())
+    ds.close()
+
+
+def test_colunas_numericas_sem_copia_e_somente_leitura(shm_name):
+    shared_dataset.publish(shm_name)
+    ds = shared_dataset.attach(shm_name)
+    receita = ds.column("receita_anual")
+    assert not receita.flags.owndata
+    assert not receita.flags.writeable
+    with pytest.raises(ValueError):
+        receita[0] = 1
+    del receita
+    ds.close()
+
+
+def test_worker_em_outro_processo_e_reload(shm_name):
+    df = load_dataset()
+    shared_dataset.publish(shm_name, df.head(10))
+    out = mp.get_context("spawn").Queue()
+    p = mp.get_context("spawn").Process(target=_find_in_child, args=(shm_name, ["Empresa 3"], out))
+    p.start()
+    gen, rows = out.get(timeout=30)
+    p.join(timeout=30)
+    assert gen == 1
+    assert rows[0]["empresa"] == "Empresa 3"
+
+    # Reload: nova geração visível pelo contador
+    novo = df.head(3).copy()
+    novo.loc[0, "empresa"] = "Nova Empresa"
+    assert shared_dataset.publish(shm_name, novo) == 2
+    assert shared_dataset.current_generation(shm_name) == 2
+    ds = shared_dataset.attach(shm_name)
+    assert ds.generation == 2
+    assert ds.find("nova")["empresa"] == "Nova Empresa"
+    assert ds.find("Empresa 9") is None
+    ds.close()
+
+
+def test_reload_com_threads_buscando(shm_name, monkeypatch):
+    # Republicar enquanto outras threads buscam não pode quebrar quem está na visão antiga
+    df = load_dataset().head(500)
+    monkeypatch.setattr(dataset, "DATASET_SHM_NAME", shm_name)
+    monkeypatch.setattr(dataset, "_SHARED", None)
+    shared_dataset.publish(shm_name, df)
+
+    erros, parar = [], threading.Event()
+
+    def _buscar():
+        while not parar.is_set():
+            try:
+                assert dataset._find_empresa("Empresa 29")["empresa"] == "Empresa 29"
+            except Exception as exc:  # noqa: BLE001 - queremos contar qualquer falha
+                erros.append(repr(exc))
+
+    threads = [threading.Thread(target=_buscar) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for _ in range(30):
+        shared_dataset.publish(shm_name, df)
+    parar.set()
+    for t in threads:
+        t.join()
+    dataset._close_shared()
+    assert erros == []
+
+
+def test_worker_reanexa_apos_restart_do_loader(shm_name, monkeypatch):
+    # Loader encerra (unlink) e outro sobe do zero: o worker precisa ver os dados novos
+    df = load_dataset().head(10)
+    monkeypatch.setattr(dataset, "DATASET_SHM_NAME", shm_name)
+    monkeypatch.setattr(dataset, "_SHARED", None)
+    shared_dataset.publish(shm_name, df)
+    assert dataset._find_empresa("Empresa 3")["empresa"] == "Empresa 3"
+    epoch_antigo = shared_dataset.current_version(shm_name)[0]
+
+    shared_dataset.unlink(shm_name)
+    # Sem loader: segue servindo a última versão
+    assert shared_dataset.current_version(shm_name)[0] == 0
+    assert dataset._find_empresa("Empresa 3")["empresa"] == "Empresa 3"
+
+    novo = df.copy()
+    novo.loc[2, "empresa"] = "Renomeada"
+    assert shared_dataset.publish(shm_name, novo) == 1  # contador recomeça no loader novo
+    epoch, gen = shared_dataset.current_version(shm_name)
+    assert epoch not in (0, epoch_antigo) and gen == 1
+    assert dataset._find_empresa("Renomeada")["empresa"] == "Renomeada"
+    dataset._close_shared()
+
+
+def test_worker_ve_dados_novos_apos_loader_morto(shm_name, monkeypatch, tmp_path):
+    # Loader morto por SIGKILL (sem unlink): o loader novo continua no mesmo controle
+    df = load_dataset().head(10)
+    df.to_csv(tmp_path / "dadoscreditoficticios.csv", index=False)
+    monkeypatch.setattr(dataset, "DATASET_SHM_NAME", shm_name)
+    monkeypatch.setattr(dataset, "_SHARED", None)
+
+    loader = _subir_loader(shm_name, tmp_path, 1)
+    try:
+        assert dataset._find_empresa("Empresa 3")["empresa"] == "Empresa 3"
+        loader.kill()
+        loader.wait(timeout=30)
+        time.sleep(0.5)  # tempo para o resource_tracker do loader morto agir, se fosse agir
+        shared_dataset._attach_shm(f"{shm_name}_g1").close()  # segmento sobreviveu
+
+        novo = df.copy()
+        novo.loc[2, "empresa"] = "Renomeada"
+        novo.to_csv(tmp_path / "dadoscreditoficticios.csv", index=False)
+        loader = _subir_loader(shm_name, tmp_path, 2)
+        assert dataset._find_empresa("Renomeada")["empresa"] == "Renomeada"
+        assert dataset._find_empresa("Empresa 3") is None
+        with pytest.raises(FileNotFoundError):
+            shared_dataset._attach_shm(f"{shm_name}_g1")  # geração órfã removida
+    finally:
+        dataset._close_shared()
+        loader.terminate()  # SIGTERM: o loader remove os segmentos
+        loader.wait(timeout=30)
+
+
+def test_restarts_do_loader_com_threads_buscando(shm_name, monkeypatch):
+    # Reanexar o controle enquanto outras threads leem dele não pode virar erro (500)
+    df = load_dataset().head(50)
+    monkeypatch.setattr(dataset, "DATASET_SHM_NAME", shm_name)
+    monkeypatch.setattr(dataset, "_SHARED", None)
+    shared_dataset.publish(shm_name, df)
+
+    erros, parar = [], threading.Event()
+
+    def _buscar():
+        while not parar.is_set():
+            try:
+                assert dataset._find_empresa("Empresa 29")["empresa"] == "Empresa 29"
+            except Exception as exc:  # noqa: BLE001 - queremos contar qualquer falha
+                erros.append(repr(exc))
+            time.sleep(0.001)  # sem isso as threads disputam o GIL com o publish
+
+    threads = [threading.Thread(target=_buscar) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for _ in range(15):
+        shared_dataset.unlink(shm_name)
+        shared_dataset.publish(shm_name, df)
+    parar.set()
+    for t in threads:
+        t.join()
+    assert shared_dataset.current_version(shm_name) == dataset._shared_view().version
+    dataset._close_shared()
+    assert erros == []
@@ -0,0 +1,110 @@
+# -----------------------------------------------------------------------------
+# Testes da coalescência de chamadas concorrentes (app/services/singleflight.py).
+# -----------------------------------------------------------------------------
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import dataset
+from app.services.singleflight import SingleFlight, metricas
+from app.services.dataset import find_empresa
+
+def _lento(contador, liberar):
+    contador.append(1)
+    liberar.wait(5)
+    return {"ok": len(contador)}
+
+def _esperar_em_voo(sf, n):
+    # espera até n chamadas terem entrado na tabela
+    for _ in range(500):
+        if sf.metricas()["chamadas"] >= n:
+            return
+        time.sleep(0.01)
+
+def test_threads_com_mesma_chave_executam_uma_vez():
+    sf = SingleFlight("t")
+    contador, liberar = [], threading.Event()
+    with ThreadPoolExecutor(8) as pool:
+        futs = [pool.submit(sf.do, "k", _lento, contador, liberar) for _ in range(8)]
+        _esperar_em_voo(sf, 8)
+        liberar.set()
+        resultados = [f.result() for f in futs]
+    assert contador == [1]
+    assert all(r == {"ok": 1} for r in resultados)
+    assert sf.metricas() == {"chamadas": 8, "execucoes": 1, "coalescidas": 7, "em_voo": 0}
+
+def test_async_e_threads_compartilham_a_execucao():
+    sf = SingleFlight("t")
+    contador, liberar = [], threading.Event()
+
+    async def cenario():
+        loop = asyncio.get_running_loop()
+        tarefas = [asyncio.create_task(sf.do_async("k", _lento, contador, liberar)) for _ in range(3)]
+        thread = loop.run_in_executor(None, sf.do, "k", _lento, contador, liberar)
+        await asyncio.to_thread(_esperar_em_voo, sf, 4)
+        liberar.set()
+        return await asyncio.gather(*tarefas, thread)
+
+    assert asyncio.run(cenario()) == [{"ok": 1}] * 4
+    assert sf.metricas()["coalescidas"] == 3
+
+def test_erro_propagado_e_chave_liberada():
+    sf = SingleFlight("t")
+
+    def falha():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        sf.do("k", falha)
+    assert sf.do("k", lambda: 42) == 42
+    assert sf.metricas()["execucoes"] == 2
+
+def test_find_empresa_devolve_copias():
+    a = find_empresa("Empresa 29")
+    b = find_empresa(" empresa 29 ")
+    assert a == b and a is not b
+
+def test_cancelar_um_waiter_nao_afeta_os_demais():
+    # Cliente que desconecta (tarefa cancelada) não pode derrubar os pedidos coalescidos
+    sf = SingleFlight("t")
+    contador, liberar = [], threading.Event()
+
+    async def cenario():
+        loop = asyncio.get_running_loop()
+        lider = asyncio.create_task(sf.do_async("k", _lento, contador, liberar))
+        seguidor = asyncio.create_task(sf.do_async("k", _lento, contador, liberar))
+        thread = loop.run_in_executor(None, sf.do, "k", _lento, contador, liberar)
+        await asyncio.to_thread(_esperar_em_voo, sf, 3)
+        lider.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await lider
+        liberar.set()
+        return await asyncio.gather(seguidor, thread)
+
+    assert asyncio.run(cenario()) == [{"ok": 1}, {"ok": 1}]
+    assert contador == [1]
+
+def test_metricas_do_find_empresa(monkeypatch):
+    # Buscas simultâneas pelo mesmo nome: uma execução, as demais contadas como coalescidas
+    liberar = threading.Event()
+    original = dataset._find_empresa
+
+    def _lenta(nome):
+        liberar.wait(5)
+        return original(nome)
+
+    monkeypatch.setattr(dataset, "_find_empresa", _lenta)
+    antes = metricas()["find_empresa"]
+    with ThreadPoolExecutor(6) as pool:
+        futs = [pool.submit(find_empresa, "Empresa 29") for _ in range(6)]
+        _esperar_em_voo(dataset._FIND, antes["chamadas"] + 6)
+        liberar.set()
+        assert all(f.result()["empresa"] == "Empresa 29" for f in futs)
+
+    depois = metricas()["find_empresa"]
+    assert depois["execucoes"] - antes["execucoes"] == 1
+    assert depois["coalescidas"] - antes["coalescidas"] == 5
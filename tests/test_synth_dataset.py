@@ -0,0 +1,40 @@
+# -----------------------------------------------------------------------------
+# Testes do gerador de datasets sintéticos (bench/synth_dataset.py):
+# cada formato/variante de cabeçalho precisa ser lido pelo loader do serviço.
+# -----------------------------------------------------------------------------
+
+import pytest
+
+from app.services import dataset
+from bench.synth_dataset import gerar, FORMATS, HEADERS
+
+def _ler(monkeypatch, path):
+    monkeypatch.setattr(dataset, "DATA_DIR", path.parent)
+    return dataset._read_any()
+
+@pytest.mark.parametrize("fmt", list(FORMATS))
+def test_formatos_lidos_pelo_loader(tmp_path, monkeypatch, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    if fmt == "xml":
+        pytest.importorskip("lxml")
+    # chunk menor que rows: garante que a gravação em blocos fecha o arquivo certo
+    path = gerar(250, tmp_path, [fmt], chunk=100)[fmt]
+    df = _ler(monkeypatch, path)
+    assert list(df.columns) == dataset.PADRONIZADAS
+    assert len(df) == 250
+    assert df["empresa"].iloc[-1] == "Empresa 250"
+    assert df["receita_anual"].between(100_000, 1_000_000).all()
+
+@pytest.mark.parametrize("headers", list(HEADERS))
+def test_variantes_de_cabecalho(tmp_path, monkeypatch, headers):
+    path = gerar(50, tmp_path, ["csv"], headers=headers)["csv"]
+    assert list(_ler(monkeypatch, path).columns) == dataset.PADRONIZADAS
+
+def test_mesmo_seed_mesmos_dados_e_sujeira_limpa(tmp_path, monkeypatch):
+    a = gerar(300, tmp_path / "a", ["csv", "ndjson"], seed=3, chunk=70, dirty=0.1)
+    df_csv = _ler(monkeypatch, a["csv"])
+    df_nd = _ler(monkeypatch, a["ndjson"])
+    assert len(df_csv) < 300  # nomes vazios removidos pelo _normalize_columns
+    assert df_csv["empresa"].tolist() == df_nd["empresa"].tolist()
+    assert df_csv["receita_anual"].isna().any()